@@ -1,41 +1,95 @@
 # A/B Testing Framework for Product Analytics
 # Statistical testing for conversion rate experiments
 
+import sys
+from math import erfc, sqrt
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
-from scipy import stats
-import matplotlib.pyplot as plt
+from joblib import Parallel, delayed
+from numba import njit
+
+# Scripts are run from their own folder; make the repository root importable
+# so the shared helpers in common/ resolve
+_REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+from common import kernels
+from common.event_data import load_events
+
+@njit(cache=True)
+def _z_test(control_conv, control_total, treatment_conv, treatment_total):
+    # Pooled two-proportion z-test; returns (z, two-sided p-value)
+    if control_total == 0 or treatment_total == 0:
+        # An arm with no sessions has no rate to compare
+        return np.nan, np.nan
+    p_control = control_conv / control_total
+    p_treatment = treatment_conv / treatment_total
+    p_pooled = (control_conv + treatment_conv) / (control_total + treatment_total)
+    
+    se = sqrt(p_pooled * (1 - p_pooled) * (1 / control_total + 1 / treatment_total))
+    if se == 0:
+        # No conversions at all, or every session converted: the test is undefined
+        return np.nan, np.nan
+    z_score = (p_treatment - p_control) / se
+    return z_score, erfc(abs(z_score) / sqrt(2.0))
 
 class ABTestFramework:
     def __init__(self, data_path):
-        self.df = pd.read_csv(data_path)
+        self.df = load_events(data_path)
         
     def calculate_conversion_rates(self):
-        results = self.df.groupby('experiment_group').agg({
-            'session_id': 'nunique',
-            'conversion': 'sum'
-        })
+        # Both branches list groups in category order, keeping only those seen
+        if len(self.df) >= kernels.JIT_MIN_ROWS:
+            groups = self.df['experiment_group'].cat
+            sessions = self.df['session_id'].cat
+            codes = groups.codes.to_numpy()
+            n_groups = len(groups.categories)
+            observed = kernels.group_count(codes, n_groups) > 0
+            session_counts = kernels.group_nunique(codes, sessions.codes.to_numpy(),
+                                                   n_groups, len(sessions.categories))
+            conversions = kernels.group_sum(codes, self.df['conversion'].to_numpy(),
+                                            np.zeros(n_groups, np.int64))
+            results = pd.DataFrame({
+                'session_id': session_counts[observed],
+                'conversion': conversions[observed]
+            }, index=pd.CategoricalIndex(groups.categories[observed],
+                                         categories=groups.categories,
+                                         name='experiment_group'))
+        else:
+            results = self.df.groupby('experiment_group', observed=True).agg(
+                session_id=('session_id', 'nunique'),
+                conversion=('conversion', 'sum')
+            ).astype({'conversion': np.int64})
         results['conversion_rate'] = results['conversion'] / results['session_id']
         return results
     
+    @classmethod
+    def run_batch(cls, data_paths, alpha=0.05, n_jobs=-1):
+        """
+        Run the z-test for several experiment files in parallel worker processes
+        Returns one result dict per path, in the same order as data_paths
+        """
+        return Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(_run_experiment)(cls, path, alpha) for path in data_paths
+        )
+    
     def run_statistical_test(self, alpha=0.05):
-        control = self.df[self.df['experiment_group'] == 'control']
-        treatment = self.df[self.df['experiment_group'] == 'treatment']
-        
-        control_conv = control['conversion'].sum()
-        control_total = control['session_id'].nunique()
+        # Reuse the per-group aggregation rather than filtering each arm
+        # An arm missing from the file counts as zero sessions, giving NaN results
+        rates = self.calculate_conversion_rates()[['session_id', 'conversion']]
+        rates = rates.reindex(['control', 'treatment'], fill_value=0)
         
-        treatment_conv = treatment['conversion'].sum()
-        treatment_total = treatment['session_id'].nunique()
+        # NumPy scalars keep the old nan/inf results when an arm has no conversions
+        control_total, control_conv = rates.loc['control'].to_numpy()
+        treatment_total, treatment_conv = rates.loc['treatment'].to_numpy()
         
         # Z-test for proportions
         p_control = control_conv / control_total
         p_treatment = treatment_conv / treatment_total
-        p_pooled = (control_conv + treatment_conv) / (control_total + treatment_total)
-        
-        se = np.sqrt(p_pooled * (1 - p_pooled) * (1/control_total + 1/treatment_total))
-        z_score = (p_treatment - p_control) / se
-        p_value = 2 * (1 - stats.norm.cdf(abs(z_score)))
+        z_score, p_value = _z_test(control_conv, control_total,
+                                   treatment_conv, treatment_total)
         
         lift = ((p_treatment - p_control) / p_control) * 100
         
@@ -48,6 +102,10 @@ class ABTestFramework:
             'statistically_significant': p_value < alpha
         }
 
+def _run_experiment(framework_cls, data_path, alpha):
+    # Module-level so loky workers can unpickle it
+    return framework_cls(data_path).run_statistical_test(alpha)
+
 if __name__ == "__main__":
     ab_test = ABTestFramework('../data/ecommerce_data.csv')
     results = ab_test.run_statistical_test()
@@ -6,17 +6,56 @@ including conversion funnels, cohort analysis, and revenue metrics
 """
 
 import pandas as pd
+import polars as pl
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # headless backend; charts are only written to disk
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 from datetime import datetime, timedelta
+from pathlib import Path
+import sys
 import warnings
-warnings.filterwarnings('ignore')
+# Silence only seaborn's deprecation chatter; accidental chained-assignment
+# copies fail loudly (pandas 3 removed the warning in favour of copy-on-write)
+warnings.filterwarnings('ignore', category=FutureWarning, module='seaborn')
+if hasattr(pd.errors, 'SettingWithCopyWarning'):
+    warnings.filterwarnings('error', category=pd.errors.SettingWithCopyWarning)
+
+# Scripts are run from their own folder; make the repository root importable
+# so the shared helpers in common/ resolve
+_REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+from common import kernels
+from common.event_data import fresh_parquet_cache, load_events
 
 # Set styling
 sns.set_style('whitegrid')
 plt.rcParams['figure.figsize'] = (14, 8)
 
+# Polars schema for the lazy summary scan over the same CSV
+POLARS_SCHEMA = {
+    'user_id': pl.Int64,
+    'event_type': pl.Categorical,
+    'revenue': pl.Float64,
+    'conversion': pl.Int8
+}
+
+# Funnel stages in order, mapped to the event_type that marks each one
+FUNNEL_STAGES = [
+    ('Page Views', 'page_view'),
+    ('Add to Cart', 'add_to_cart'),
+    ('Purchase', 'purchase')
+]
+
+# Fixed-width row layouts for the printed report tables
+FUNNEL_HEADER = "{:<15s} {:>10s} {:>16s} {:>10s}"
+FUNNEL_ROW = "{:<15s} {:>10,d} {:>15.2f}% {:>9.2f}%"
+SEGMENT_HEADER = "{:<12s} {:>10s} {:>12s} {:>14s} {:>16s}"
+SEGMENT_ROW = "{:<12s} {:>10,d} {:>12,d} {:>14,.2f} {:>15.2f}%"
+
 class ProductAnalyticsDashboard:
     """
     Main class for product analytics operations
@@ -24,47 +63,74 @@ class ProductAnalyticsDashboard:
     
     def __init__(self, data_path):
         """Initialize dashboard with data"""
-        self.df = pd.read_csv(data_path)
-        self.df['timestamp'] = pd.to_datetime(self.df['timestamp'])
-        self.df['date'] = self.df['timestamp'].dt.date
-        print(f"Loaded {len(self.df)} rows of data")
+        self.data_path = data_path
+        # Full pandas frame, only materialized by the analyses that need rows
+        self._df = None
+        self._lf = None
+        self._summary_stats = None
+        # Single figure reused by every chart, created on the first plot
+        self._fig = None
+    
+    @property
+    def df(self):
+        """Event data as a pandas frame, loaded on first access"""
+        if self._df is None:
+            self._df = load_events(self.data_path)
+            # Day-truncated datetime64 rather than datetime.date objects
+            self._df['date'] = self._df['timestamp'].dt.normalize()
+            print(f"Loaded {len(self._df)} rows of data")
+        return self._df
+    
+    @property
+    def lf(self):
+        """Lazy scan for the headline aggregates, preferring the Parquet sidecar"""
+        if self._lf is None:
+            cache_path = fresh_parquet_cache(self.data_path)
+            if cache_path is not None:
+                self._lf = pl.scan_parquet(cache_path)
+            else:
+                self._lf = pl.scan_csv(self.data_path, schema_overrides=POLARS_SCHEMA)
+        return self._lf
+    
+    def _summary(self):
+        """Headline metrics and funnel counts from a single streaming query"""
+        if self._summary_stats is None:
+            session = pl.col('session_id')
+            revenue = pl.col('revenue')
+            self._summary_stats = self.lf.select(
+                pl.len().alias('rows'),
+                # drop_nulls so distinct counts match pandas nunique, which skips NaN
+                session.drop_nulls().n_unique().alias('sessions'),
+                pl.col('user_id').drop_nulls().n_unique().alias('users'),
+                session.filter(pl.col('conversion') == 1).drop_nulls().n_unique().alias('conversions'),
+                revenue.sum().alias('revenue'),
+                # Polars yields null for the mean of no rows; pandas gave NaN
+                revenue.filter(revenue > 0).mean().fill_null(float('nan')).alias('avg_order_value'),
+                *[session.filter(pl.col('event_type') == event).drop_nulls().n_unique().alias(event)
+                  for _, event in FUNNEL_STAGES]
+            ).collect(engine='streaming').row(0, named=True)
+        return self._summary_stats
     
     def calculate_conversion_metrics(self):
         """Calculate key conversion metrics"""
-        total_sessions = self.df['session_id'].nunique()
-        total_users = self.df['user_id'].nunique()
-        
-        # Calculate conversions
-        conversions = self.df[self.df['conversion'] == 1]['session_id'].nunique()
-        conversion_rate = (conversions / total_sessions) * 100
-        
-        # Revenue metrics
-        total_revenue = self.df['revenue'].sum()
-        avg_order_value = self.df[self.df['revenue'] > 0]['revenue'].mean()
+        summary = self._summary()
+        conversion_rate = (summary['conversions'] / summary['sessions']) * 100
         
         metrics = {
-            'Total Sessions': total_sessions,
-            'Total Users': total_users,
-            'Conversions': conversions,
+            'Total Sessions': summary['sessions'],
+            'Total Users': summary['users'],
+            'Conversions': summary['conversions'],
             'Conversion Rate': f"{conversion_rate:.2f}%",
-            'Total Revenue': f"${total_revenue:,.2f}",
-            'Average Order Value': f"${avg_order_value:,.2f}"
+            'Total Revenue': f"${summary['revenue']:,.2f}",
+            'Average Order Value': f"${summary['avg_order_value']:,.2f}"
         }
         
         return metrics
     
     def funnel_analysis(self):
         """Analyze conversion funnel"""
-        funnel_data = {}
-        
-        # Page views
-        funnel_data['Page Views'] = self.df[self.df['event_type'] == 'page_view']['session_id'].nunique()
-        
-        # Add to cart
-        funnel_data['Add to Cart'] = self.df[self.df['event_type'] == 'add_to_cart']['session_id'].nunique()
-        
-        # Purchases
-        funnel_data['Purchase'] = self.df[self.df['event_type'] == 'purchase']['session_id'].nunique()
+        summary = self._summary()
+        funnel_data = {stage: summary[event] for stage, event in FUNNEL_STAGES}
         
         # Calculate drop-off rates
         funnel_df = pd.DataFrame({
@@ -79,73 +145,112 @@ class ProductAnalyticsDashboard:
     
     def cohort_analysis(self):
         """Perform cohort analysis"""
-        # Group by user and get first purchase date
-        user_cohorts = self.df[self.df['conversion'] == 1].groupby('user_id').agg({
-            'date': 'min'
-        }).reset_index()
-        user_cohorts.columns = ['user_id', 'cohort_date']
-        
-        # Merge back with main data
-        cohort_df = self.df.merge(user_cohorts, on='user_id', how='left')
+        # First conversion date per user, broadcast back onto every row
+        conversion_dates = self.df['date'].where(self.df['conversion'].eq(1))
+        self.df['cohort_date'] = conversion_dates.groupby(self.df['user_id']).transform('min')
         
-        return cohort_df
+        return self.df
+    
+    def _jit_session_counts(self, key):
+        """Unique sessions per category of key, computed with group_nunique"""
+        labels = self.df[key].cat
+        sessions = self.df['session_id'].cat
+        counts = kernels.group_nunique(labels.codes.to_numpy(), sessions.codes.to_numpy(),
+                                       len(labels.categories), len(sessions.categories))
+        return pd.Series(counts, index=labels.categories, name='session_id')
+    
+    def _segment_metrics(self, key):
+        """Aggregate sessions, conversions and revenue for one dimension"""
+        # Both branches list groups in category order, keeping only those seen
+        if len(self.df) >= kernels.JIT_MIN_ROWS:
+            labels = self.df[key].cat
+            codes = labels.codes.to_numpy()
+            n_groups = len(labels.categories)
+            observed = kernels.group_count(codes, n_groups) > 0
+            conversions = kernels.group_sum(codes, self.df['conversion'].to_numpy(),
+                                            np.zeros(n_groups, np.int64))
+            revenue = kernels.group_sum(codes, self.df['revenue'].to_numpy(),
+                                        np.zeros(n_groups, np.float64))
+            metrics = pd.DataFrame({
+                key: pd.Categorical(labels.categories[observed], categories=labels.categories),
+                'sessions': self._jit_session_counts(key).to_numpy()[observed],
+                'conversions': conversions[observed],
+                'revenue': revenue[observed]
+            })
+        else:
+            metrics = self.df.groupby(key, observed=True).agg(
+                sessions=('session_id', 'nunique'),
+                conversions=('conversion', 'sum'),
+                revenue=('revenue', 'sum')
+            ).astype({'conversions': np.int64}).reset_index()
+        metrics['conversion_rate'] = metrics['conversions'] / metrics['sessions'] * 100
+        return metrics
     
     def device_channel_analysis(self):
         """Analyze performance by device and channel"""
-        # Device analysis
-        device_metrics = self.df.groupby('device').agg({
-            'session_id': 'nunique',
-            'conversion': 'sum',
-            'revenue': 'sum'
-        }).reset_index()
-        device_metrics['conversion_rate'] = (device_metrics['conversion'] / device_metrics['session_id'] * 100).round(2)
-        
-        # Channel analysis
-        channel_metrics = self.df.groupby('channel').agg({
-            'session_id': 'nunique',
-            'conversion': 'sum',
-            'revenue': 'sum'
-        }).reset_index()
-        channel_metrics['conversion_rate'] = (channel_metrics['conversion'] / channel_metrics['session_id'] * 100).round(2)
+        device_metrics = self._segment_metrics('device')
+        channel_metrics = self._segment_metrics('channel')
         
         return device_metrics, channel_metrics
     
+    def _figure(self, width, height):
+        """Shared chart figure, cleared and resized for the next plot"""
+        if self._fig is None:
+            # A bare Figure is not tracked by pyplot, so instances leave nothing open
+            self._fig = Figure()
+        self._fig.clear()
+        self._fig.set_size_inches(width, height)
+        return self._fig
+    
     def plot_funnel(self, funnel_df):
         """Visualize conversion funnel"""
-        plt.figure(figsize=(12, 6))
-        plt.subplot(1, 2, 1)
-        plt.barh(funnel_df['Stage'], funnel_df['Sessions'], color='steelblue')
-        plt.xlabel('Number of Sessions')
-        plt.title('Conversion Funnel')
-        plt.gca().invert_yaxis()
-        
-        plt.subplot(1, 2, 2)
-        plt.barh(funnel_df['Stage'], funnel_df['Conversion_Rate'], color='coral')
-        plt.xlabel('Conversion Rate (%)')
-        plt.title('Conversion Rate by Stage')
-        plt.gca().invert_yaxis()
-        
-        plt.tight_layout()
-        plt.savefig('outputs/funnel_analysis.png', dpi=300, bbox_inches='tight')
+        fig = self._figure(12, 6)
+        ax_sessions, ax_rate = fig.subplots(1, 2)
+        
+        ax_sessions.barh(funnel_df['Stage'], funnel_df['Sessions'], color='steelblue')
+        ax_sessions.set_xlabel('Number of Sessions')
+        ax_sessions.set_title('Conversion Funnel')
+        ax_sessions.invert_yaxis()
+        
+        ax_rate.barh(funnel_df['Stage'], funnel_df['Conversion_Rate'], color='coral')
+        ax_rate.set_xlabel('Conversion Rate (%)')
+        ax_rate.set_title('Conversion Rate by Stage')
+        ax_rate.invert_yaxis()
+        
+        fig.tight_layout()
+        fig.savefig('outputs/funnel_analysis.png', dpi=150, bbox_inches='tight')
         print("Funnel analysis chart saved!")
     
     def plot_revenue_trends(self):
         """Plot revenue trends over time"""
-        daily_revenue = self.df.groupby('date')['revenue'].sum().reset_index()
-        
-        plt.figure(figsize=(14, 6))
-        plt.plot(daily_revenue['date'], daily_revenue['revenue'], marker='o', linewidth=2)
-        plt.xlabel('Date')
-        plt.ylabel('Revenue ($)')
-        plt.title('Daily Revenue Trends')
-        plt.xticks(rotation=45)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig('outputs/revenue_trends.png', dpi=300, bbox_inches='tight')
+        # Binned daily totals over the timestamp index; empty days are 0
+        daily_revenue = self.df.set_index('timestamp')['revenue'].resample('D').sum()
+        
+        fig = self._figure(14, 6)
+        ax = fig.subplots()
+        # Point markers only for short series; they dominate render time on long ones
+        marker = 'o' if len(daily_revenue) <= 500 else None
+        ax.plot(daily_revenue.index, daily_revenue.to_numpy(), marker=marker, linewidth=1.5)
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Revenue ($)')
+        ax.set_title('Daily Revenue Trends')
+        ax.tick_params(axis='x', labelrotation=45)
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        fig.savefig('outputs/revenue_trends.png', dpi=150, bbox_inches='tight')
         print("Revenue trends chart saved!")
     
+    def _print_table(self, header, row_format, df):
+        """Print a report table row by row with a fixed format string"""
+        print(header)
+        for row in df.itertuples(index=False):
+            print(row_format.format(*row))
+    
     def generate_full_report(self):
         """Generate comprehensive analytics report"""
+        # The segment tables and charts need every row, so load the frame up
+        # front; this also writes the Parquet sidecar the summary scan reads
+        self.df
         print("=" * 60)
         print("PRODUCT ANALYTICS DASHBOARD REPORT")
         print("=" * 60)
@@ -161,18 +266,18 @@ class ProductAnalyticsDashboard:
         print("\n2. CONVERSION FUNNEL")
         print("-" * 60)
         funnel_df = self.funnel_analysis()
-        print(funnel_df.to_string(index=False))
+        self._print_table(FUNNEL_HEADER.format(*funnel_df.columns), FUNNEL_ROW, funnel_df)
         self.plot_funnel(funnel_df)
         
         # Device & Channel
         print("\n3. DEVICE PERFORMANCE")
         print("-" * 60)
         device_metrics, channel_metrics = self.device_channel_analysis()
-        print(device_metrics.to_string(index=False))
+        self._print_table(SEGMENT_HEADER.format(*device_metrics.columns), SEGMENT_ROW, device_metrics)
         
         print("\n4. CHANNEL PERFORMANCE")
         print("-" * 60)
-        print(channel_metrics.to_string(index=False))
+        self._print_table(SEGMENT_HEADER.format(*channel_metrics.columns), SEGMENT_ROW, channel_metrics)
         
         # Visualizations
         self.plot_revenue_trends()
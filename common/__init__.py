@@ -0,0 +1 @@
+# Shared helpers for the analysis dashboard and A/B testing scripts
@@ -0,0 +1,79 @@
+# Event log schema and loader shared by the dashboard and A/B framework
+# Both scripts read and write the same Parquet sidecar, so the schema that
+# produces it must live in exactly one place
+
+import hashlib
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Column types for the e-commerce event log; low-cardinality labels are
+# parsed straight into categoricals so masks and groupbys work on codes
+DTYPES = {
+    'user_id': 'int64',
+    'session_id': 'category',
+    'event_type': 'category',
+    'conversion': 'int8',
+    'device': 'category',
+    'channel': 'category',
+    'experiment_group': 'category'
+}
+
+# Integer columns downcast after parsing; ids and counters rarely need 64 bits
+NARROW_INT_COLUMNS = ['user_id', 'page_views', 'time_spent_seconds']
+
+# Bump when load_events changes how columns are derived without touching
+# the dtype tables above
+LOADER_REVISION = 1
+
+# Fingerprint stored in the sidecar's Parquet metadata; a sidecar written
+# under any other schema is treated as stale and rebuilt from the CSV
+SCHEMA_KEY = b'event_data_schema'
+SCHEMA_VERSION = hashlib.sha1(
+    repr((LOADER_REVISION, sorted(DTYPES.items()), NARROW_INT_COLUMNS)).encode()
+).hexdigest()[:12].encode()
+
+def fresh_parquet_cache(data_path):
+    """Return the Parquet sidecar of data_path if it is current for the CSV and schema"""
+    csv_path = Path(data_path)
+    cache_path = csv_path.with_suffix('.parquet')
+    if not cache_path.exists() or cache_path.stat().st_mtime < csv_path.stat().st_mtime:
+        return None
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if metadata.get(SCHEMA_KEY) != SCHEMA_VERSION:
+        return None
+    return cache_path
+
+def load_events(data_path):
+    """Read the event log, reusing the Parquet sidecar when it is current"""
+    cache_path = fresh_parquet_cache(data_path)
+    if cache_path is not None:
+        return pd.read_parquet(cache_path)
+    
+    cache_path = Path(data_path).with_suffix('.parquet')
+    df = pd.read_csv(data_path, engine='pyarrow', dtype=DTYPES,
+                     parse_dates=['timestamp'])
+    # Parquet has no second resolution; match what a cached read returns
+    df['timestamp'] = df['timestamp'].astype('datetime64[ms]')
+    # Narrow integer columns to the smallest type that holds their range
+    for column in NARROW_INT_COLUMNS:
+        df[column] = pd.to_numeric(df[column], downcast='integer')
+    # Write under a per-process name and rename, so parallel readers never
+    # see a half-written cache
+    tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**table.schema.metadata,
+                                               SCHEMA_KEY: SCHEMA_VERSION})
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # e.g. read-only data directory; parse the CSV again next time
+        tmp_path.unlink(missing_ok=True)
+    return df
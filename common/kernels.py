@@ -0,0 +1,43 @@
+# Numba grouped-aggregation kernels used by the dashboard and A/B framework
+# on frames too large for the pandas groupby path
+
+import numpy as np
+from numba import njit
+
+# Row count from which grouped aggregations switch to the numba kernels
+JIT_MIN_ROWS = 1_000_000
+
+@njit(cache=True)
+def group_count(labels, n_groups):
+    """Number of rows per integer group label; -1 (missing) labels are skipped"""
+    counts = np.zeros(n_groups, np.int64)
+    for i in range(labels.size):
+        if labels[i] >= 0:
+            counts[labels[i]] += 1
+    return counts
+
+@njit(cache=True)
+def group_sum(labels, values, out):
+    """Sum values into out by integer group label, skipping NaN like pandas"""
+    for i in range(labels.size):
+        value = values[i]
+        if labels[i] >= 0 and value == value:
+            out[labels[i]] += value
+    return out
+
+@njit(cache=True)
+def group_nunique(labels, ids, n_groups, n_ids):
+    """Count distinct integer ids per group label using one bitset per group"""
+    # Categorical session codes are dense, so each bitset is n_ids / 8 bytes
+    bits = np.zeros((n_groups, (n_ids >> 6) + 1), np.uint64)
+    counts = np.zeros(n_groups, np.int64)
+    for i in range(labels.size):
+        group = labels[i]
+        sid = ids[i]
+        if group < 0 or sid < 0:
+            continue
+        bit = np.uint64(1) << np.uint64(sid & 63)
+        if not bits[group, sid >> 6] & bit:
+            bits[group, sid >> 6] |= bit
+            counts[group] += 1
+    return counts
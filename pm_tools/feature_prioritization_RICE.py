@@ -1,13 +1,24 @@
 # RICE Framework for Feature Prioritization
 # Reach * Impact * Confidence / Effort
 
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # headless backend; charts are only written to disk
 import matplotlib.pyplot as plt
-import seaborn as sns
+
+# Colormap looked up once at import instead of rebuilding a palette per call
+_CMAP = matplotlib.colormaps['RdYlGn']
 
 class RICEPrioritization:
     def __init__(self):
-        self.features = []
+        # Feature attributes are kept as parallel columns; scores are
+        # computed in one vectorized pass when the list is requested
+        self.names = []
+        self.reach = []
+        self.impact = []
+        self.confidence = []
+        self.effort = []
     
     def add_feature(self, name, reach, impact, confidence, effort):
         """
@@ -17,33 +28,46 @@ class RICEPrioritization:
         confidence: percentage (0-100)
         effort: person-months
         """
-        rice_score = (reach * impact * (confidence/100)) / effort
+        if effort <= 0:
+            raise ValueError(f"effort must be positive person-months, got {effort!r}")
         
-        self.features.append({
-            'name': name,
-            'reach': reach,
-            'impact': impact,
-            'confidence': confidence,
-            'effort': effort,
-            'rice_score': round(rice_score, 2)
-        })
+        self.names.append(name)
+        self.reach.append(reach)
+        self.impact.append(impact)
+        self.confidence.append(confidence)
+        self.effort.append(effort)
     
     def get_prioritized_list(self):
-        df = pd.DataFrame(self.features)
-        return df.sort_values('rice_score', ascending=False).reset_index(drop=True)
+        reach = np.asarray(self.reach, dtype=np.float64)
+        impact = np.asarray(self.impact, dtype=np.float64)
+        confidence = np.asarray(self.confidence, dtype=np.float64)
+        effort = np.asarray(self.effort, dtype=np.float64)
+        
+        rice_score = reach * impact * confidence * 0.01 / effort
+        order = np.argsort(-rice_score, kind='stable')
+        
+        return pd.DataFrame({
+            'name': np.asarray(self.names, dtype=object)[order],
+            'reach': np.asarray(self.reach)[order],
+            'impact': np.asarray(self.impact)[order],
+            'confidence': np.asarray(self.confidence)[order],
+            'effort': np.asarray(self.effort)[order],
+            'rice_score': rice_score[order].round(2)
+        })
     
     def visualize(self):
         df = self.get_prioritized_list()
         
-        plt.figure(figsize=(12, 6))
-        colors = sns.color_palette('RdYlGn', len(df))
+        plt.figure(figsize=(10, 0.4 * len(df) + 1))
+        # Evenly spaced by rank, skipping the colormap's extreme ends
+        colors = _CMAP(np.linspace(0, 1, len(df) + 2)[1:-1])
         
-        plt.barh(df['name'], df['rice_score'], color=colors)
+        plt.barh(df['name'], df['rice_score'].to_numpy(), color=colors)
         plt.xlabel('RICE Score')
         plt.title('Feature Prioritization using RICE Framework')
         plt.gca().invert_yaxis()
         plt.tight_layout()
-        plt.savefig('outputs/rice_prioritization.png', dpi=300, bbox_inches='tight')
+        plt.savefig('outputs/rice_prioritization.png', dpi=150, bbox_inches='tight')
         print("Visualization saved!")
 
 if __name__ == "__main__":
@@ -0,0 +1,33 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_CSV = REPO_ROOT / 'data' / 'ecommerce_data.csv'
+
+# The analysis modules are scripts, not an installed package
+sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture
+def sample_csv(tmp_path):
+    """Copy of the bundled sample so Parquet sidecars land in tmp_path"""
+    path = tmp_path / 'events.csv'
+    shutil.copy(SAMPLE_CSV, path)
+    return path
+
+
+@pytest.fixture
+def edited_csv(tmp_path):
+    """Factory writing a copy of the sample with some columns overwritten"""
+    def write(name, **columns):
+        df = pd.read_csv(SAMPLE_CSV)
+        for column, values in columns.items():
+            df[column] = values
+        path = tmp_path / f'{name}.csv'
+        df.to_csv(path, index=False)
+        return path
+    return write
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from ab_testing.ab_test_framework import ABTestFramework
+from common import kernels
+
+
+def test_conversion_rates_jit_path_matches_pandas(sample_csv, monkeypatch):
+    framework = ABTestFramework(sample_csv)
+    expected = framework.calculate_conversion_rates()
+
+    monkeypatch.setattr(kernels, 'JIT_MIN_ROWS', 0)
+    pd.testing.assert_frame_equal(framework.calculate_conversion_rates(), expected)
+
+
+def test_statistical_test_without_conversions_is_undefined(edited_csv):
+    framework = ABTestFramework(edited_csv('no_conversions', conversion=0, revenue=0.0))
+    results = framework.run_statistical_test()
+
+    assert pd.isna(results['z_score'])
+    assert pd.isna(results['p_value'])
+    assert not results['statistically_significant']
+
+
+def test_statistical_test_with_missing_arm_is_undefined(edited_csv):
+    framework = ABTestFramework(edited_csv('treatment_only', experiment_group='treatment'))
+    results = framework.run_statistical_test()
+
+    assert pd.isna(results['control_rate'])
+    assert results['treatment_rate'] == 0.45
+    assert pd.isna(results['z_score'])
+    assert pd.isna(results['p_value'])
+    assert not results['statistically_significant']
+
+    control_only = edited_csv('control_only', experiment_group='control')
+    batch = ABTestFramework.run_batch([control_only], n_jobs=1)
+    assert pd.isna(batch[0]['treatment_rate'])
@@ -0,0 +1,77 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from analysis.product_analytics_dashboard import ProductAnalyticsDashboard
+from common import kernels
+
+
+def test_segment_metrics_jit_path_matches_pandas(sample_csv, monkeypatch):
+    dashboard = ProductAnalyticsDashboard(sample_csv)
+    expected = dashboard.device_channel_analysis()
+
+    monkeypatch.setattr(kernels, 'JIT_MIN_ROWS', 0)
+    for jit, pandas in zip(dashboard.device_channel_analysis(), expected):
+        pd.testing.assert_frame_equal(jit, pandas)
+
+
+def test_segment_metrics_skip_missing_revenue(edited_csv, monkeypatch):
+    revenue = pd.read_csv(edited_csv('base'))['revenue'].to_numpy(dtype=float, copy=True)
+    revenue[2] = np.nan
+    dashboard = ProductAnalyticsDashboard(edited_csv('missing_revenue', revenue=revenue))
+    expected = dashboard.device_channel_analysis()
+    assert expected[0]['revenue'].notna().all()
+
+    monkeypatch.setattr(kernels, 'JIT_MIN_ROWS', 0)
+    for jit, pandas in zip(dashboard.device_channel_analysis(), expected):
+        pd.testing.assert_frame_equal(jit, pandas)
+
+
+def test_conversion_metrics_without_revenue(edited_csv):
+    dashboard = ProductAnalyticsDashboard(edited_csv('no_revenue', conversion=0, revenue=0.0))
+    metrics = dashboard.calculate_conversion_metrics()
+
+    assert metrics['Total Revenue'] == '$0.00'
+    assert metrics['Average Order Value'] == '$nan'
+
+
+def test_session_counts_skip_blank_session_ids(edited_csv):
+    session_id = pd.read_csv(edited_csv('base'))['session_id'].to_numpy(copy=True)
+    session_id[1] = None
+    path = edited_csv('blank_session', session_id=session_id)
+    dashboard = ProductAnalyticsDashboard(path)
+    metrics = dashboard.calculate_conversion_metrics()
+    device_metrics, channel_metrics = dashboard.device_channel_analysis()
+
+    assert metrics['Total Sessions'] == dashboard.df['session_id'].nunique() == 20
+    assert device_metrics['sessions'].sum() == channel_metrics['sessions'].sum() == 20
+    assert dashboard.funnel_analysis()['Sessions'].iloc[0] == 20
+
+    # A second instance scans the Parquet sidecar written by the first
+    cached = ProductAnalyticsDashboard(path).calculate_conversion_metrics()
+    assert cached['Total Sessions'] == 20
+
+
+def test_dashboards_leave_no_pyplot_figures_open(sample_csv, tmp_path, monkeypatch):
+    plt.close('all')
+    for _ in range(22):
+        ProductAnalyticsDashboard(sample_csv)
+    assert plt.get_fignums() == []
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'outputs').mkdir()
+    dashboard = ProductAnalyticsDashboard(sample_csv)
+    dashboard.plot_funnel(dashboard.funnel_analysis())
+    dashboard.plot_revenue_trends()
+    assert plt.get_fignums() == []
+    assert (tmp_path / 'outputs' / 'funnel_analysis.png').exists()
+    assert (tmp_path / 'outputs' / 'revenue_trends.png').exists()
+
+
+def test_headline_metrics_do_not_load_the_frame(sample_csv):
+    dashboard = ProductAnalyticsDashboard(sample_csv)
+    assert dashboard._summary_stats is None
+
+    dashboard.calculate_conversion_metrics()
+    dashboard.funnel_analysis()
+    assert dashboard._df is None
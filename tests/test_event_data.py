@@ -0,0 +1,23 @@
+import pandas as pd
+
+from common import event_data
+from common.event_data import fresh_parquet_cache, load_events
+
+
+def test_sidecar_written_with_current_schema_is_reused(sample_csv):
+    df = load_events(sample_csv)
+    cache_path = fresh_parquet_cache(sample_csv)
+
+    assert cache_path == sample_csv.with_suffix('.parquet')
+    pd.testing.assert_frame_equal(load_events(sample_csv), df)
+
+
+def test_sidecar_from_another_schema_is_rebuilt(sample_csv, monkeypatch):
+    # A sidecar without the schema fingerprint, as older versions wrote it
+    pd.read_csv(sample_csv).to_parquet(sample_csv.with_suffix('.parquet'), index=False)
+    assert fresh_parquet_cache(sample_csv) is None
+    assert load_events(sample_csv)['session_id'].dtype == 'category'
+    assert fresh_parquet_cache(sample_csv) is not None
+
+    monkeypatch.setattr(event_data, 'SCHEMA_VERSION', b'changed')
+    assert fresh_parquet_cache(sample_csv) is None
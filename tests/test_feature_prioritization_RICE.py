@@ -0,0 +1,21 @@
+import pytest
+
+from pm_tools.feature_prioritization_RICE import RICEPrioritization
+
+
+def test_features_ranked_by_rice_score():
+    rice = RICEPrioritization()
+    rice.add_feature('Personalized Recommendations', 10000, 3, 80, 4)
+    rice.add_feature('One-Click Checkout', 8000, 2, 90, 2)
+
+    prioritized = rice.get_prioritized_list()
+    assert list(prioritized['name']) == ['One-Click Checkout', 'Personalized Recommendations']
+    assert list(prioritized['rice_score']) == [7200.0, 6000.0]
+
+
+@pytest.mark.parametrize('effort', [0, -1])
+def test_add_feature_rejects_non_positive_effort(effort):
+    rice = RICEPrioritization()
+    with pytest.raises(ValueError, match='effort'):
+        rice.add_feature('Free Lunch', 1000, 1, 100, effort)
+    assert rice.get_prioritized_list().empty